@@ -25,13 +25,18 @@
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE."""
 
 
-from .core import LpSolver_CMD, LpSolver, subprocess, PulpSolverError, clock, log
-from .core import gurobi_path
+from .core import LpSolver_CMD, LpSolver, subprocess, PulpSolverError, log
+from .core import gurobi_path, devnull
 import os
 import sys
 from .. import constants
 import warnings
 
+try:
+    from time import perf_counter
+except ImportError:
+    from time import time as perf_counter
+
 # to import the gurobipy name into the module scope
 gurobipy = None
 
@@ -127,38 +132,39 @@ class GUROBI(LpSolver):
             if self.msg:
                 print("Gurobi status=", solutionStatus)
             lp.resolveOK = True
+            # both flags are reset here so the variables are only walked once
             for var in lp._variables:
-                var.isModified = False
+                var.isModified = var.modified = False
             status = gurobiLpStatus.get(solutionStatus, constants.LpStatusUndefined)
             lp.assignStatus(status)
             if status != constants.LpStatusOptimal:
                 return status
 
-            # populate pulp solution values
-            for var, value in zip(
-                lp._variables, model.getAttr(GRB.Attr.X, model.getVars())
-            ):
-                var.varValue = value
-
-            # populate pulp constraints slack
-            for constr, value in zip(
-                lp.constraints.values(),
-                model.getAttr(GRB.Attr.Slack, model.getConstrs()),
-            ):
-                constr.slack = value
-
-            if not model.getAttr(GRB.Attr.IsMIP):
-                for var, value in zip(
-                    lp._variables, model.getAttr(GRB.Attr.RC, model.getVars())
-                ):
-                    var.dj = value
-
+            # the solver objects are fetched once and reused for every attribute
+            variables = lp._variables
+            constraints = list(lp.constraints.values())
+            solverVars = model.getVars()
+            solverConstrs = model.getConstrs()
+
+            # all the attributes are fetched before a single pass over
+            # the variables and another over the constraints
+            values = model.getAttr(GRB.Attr.X, solverVars)
+            slacks = model.getAttr(GRB.Attr.Slack, solverConstrs)
+            if model.getAttr(GRB.Attr.IsMIP):
+                for var, value in zip(variables, values):
+                    var.varValue = value
+                for constr, slack in zip(constraints, slacks):
+                    constr.slack = slack
+            else:
+                reducedCosts = model.getAttr(GRB.Attr.RC, solverVars)
+                shadowPrices = model.getAttr(GRB.Attr.Pi, solverConstrs)
+                for var, value, dj in zip(variables, values, reducedCosts):
+                    var.varValue = value
+                    var.dj = dj
                 # put pi and slack variables against the constraints
-                for constr, value in zip(
-                    lp.constraints.values(),
-                    model.getAttr(GRB.Attr.Pi, model.getConstrs()),
-                ):
-                    constr.pi = value
+                for constr, slack, pi in zip(constraints, slacks, shadowPrices):
+                    constr.slack = slack
+                    constr.pi = pi
 
             return status
 
@@ -174,14 +180,16 @@ class GUROBI(LpSolver):
         def callSolver(self, lp, callback=None):
             """Solves the problem with gurobi"""
             # solve the problem
-            self.solveTime = -clock()
+            # gurobi runs in this process: the children cpu clock would be 0
+            self.solveTime = -perf_counter()
             lp.solverModel.optimize(callback=callback)
-            self.solveTime += clock()
+            self.solveTime += perf_counter()
 
         def buildSolverModel(self, lp):
             """
             Takes the pulp lp model and translates it into a gurobi model
             """
+            GRB = gurobipy.GRB
             log.debug("create the gurobi model")
             lp.solverModel = gurobipy.Model(lp.name)
             log.debug("set the sense of the problem")
@@ -197,43 +205,74 @@ class GUROBI(LpSolver):
                 lp.solverModel.setParam("LogFile", logPath)
 
             log.debug("add the variables to the problem")
-            for var in lp.variables():
-                lowBound = var.lowBound
-                if lowBound is None:
-                    lowBound = -gurobipy.GRB.INFINITY
-                upBound = var.upBound
-                if upBound is None:
-                    upBound = gurobipy.GRB.INFINITY
-                obj = lp.objective.get(var, 0.0)
-                varType = gurobipy.GRB.CONTINUOUS
-                if var.cat == constants.LpInteger and self.mip:
-                    varType = gurobipy.GRB.INTEGER
-                var.solverVar = lp.solverModel.addVar(
-                    lowBound, upBound, vtype=varType, obj=obj, name=var.name
+            # all the variables are added with a single call to addVars
+            model_variables = lp.variables()
+            infinity = GRB.INFINITY
+            lb = [
+                var.lowBound if var.lowBound is not None else -infinity
+                for var in model_variables
+            ]
+            ub = [
+                var.upBound if var.upBound is not None else infinity
+                for var in model_variables
+            ]
+
+            integer = constants.LpInteger
+            if self.mip and any(var.cat == integer for var in model_variables):
+                vtype = [
+                    GRB.INTEGER if var.cat == integer else GRB.CONTINUOUS
+                    for var in model_variables
+                ]
+            else:
+                # continuous problems share a single type for all the variables
+                vtype = GRB.CONTINUOUS
+            solverVars = lp.solverModel.addVars(
+                len(model_variables), lb=lb, ub=ub, vtype=vtype
+            )
+            solverVars = [solverVars[i] for i in range(len(model_variables))]
+            for var, solverVar in zip(model_variables, solverVars):
+                var.solverVar = solverVar
+            # the names are set afterwards: addVars subscripts the name of a
+            # single variable even when it is given in a list
+            lp.solverModel.setAttr(
+                "VarName", solverVars, [var.name for var in model_variables]
+            )
+            log.debug("set the objective of the problem")
+            # only the variables in the objective get a coefficient
+            lp.solverModel.setObjective(
+                gurobipy.LinExpr(
+                    list(lp.objective.values()),
+                    [var.solverVar for var in lp.objective.keys()],
                 )
+            )
             if self.optionsDict.get("warmStart", False):
-                # Once lp.variables() has been used at least once in the building of the model.
-                # we can use the lp._variables with the cache.
-                for var in lp._variables:
+                for var in model_variables:
                     if var.varValue is not None:
                         var.solverVar.start = var.varValue
 
-            lp.solverModel.update()
+            # the new variables can be used in the constraints without an update
             log.debug("add the Constraints to the problem")
+            # the names used in the loop are bound once to locals
+            LinExpr = gurobipy.LinExpr
+            addLConstr = lp.solverModel.addLConstr
+            gurobiSense = {
+                constants.LpConstraintLE: GRB.LESS_EQUAL,
+                constants.LpConstraintGE: GRB.GREATER_EQUAL,
+                constants.LpConstraintEQ: GRB.EQUAL,
+            }
             for name, constraint in lp.constraints.items():
-                # build the expression
-                expr = gurobipy.LinExpr(
-                    list(constraint.values()), [v.solverVar for v in constraint.keys()]
-                )
-                if constraint.sense == constants.LpConstraintLE:
-                    relation = gurobipy.GRB.LESS_EQUAL
-                elif constraint.sense == constants.LpConstraintGE:
-                    relation = gurobipy.GRB.GREATER_EQUAL
-                elif constraint.sense == constants.LpConstraintEQ:
-                    relation = gurobipy.GRB.EQUAL
-                else:
+                # build the expression from the coefficient and variable lists
+                # solverVar is read directly: a dict keyed by the pulp variables
+                # would be slower as LpElement.__hash__ is a python method
+                coefficients = list(constraint.values())
+                variables = [v.solverVar for v in constraint]
+                expr = LinExpr(coefficients, variables)
+                try:
+                    relation = gurobiSense[constraint.sense]
+                except KeyError:
                     raise PulpSolverError("Detected an invalid constraint type")
-                constraint.solverConstraint = lp.solverModel.addConstr(
+                # addLConstr skips the generic dispatch done by addConstr
+                constraint.solverConstraint = addLConstr(
                     expr, relation, -constraint.constant, name
                 )
             lp.solverModel.update()
@@ -251,8 +290,6 @@ class GUROBI(LpSolver):
             self.callSolver(lp, callback=callback)
             # get the solution information
             solutionStatus = self.findSolutionValues(lp)
-            for var in lp._variables:
-                var.modified = False
             for constraint in lp.constraints.values():
                 constraint.modified = False
             return solutionStatus
@@ -264,17 +301,22 @@ class GUROBI(LpSolver):
             uses the old solver and modifies the rhs of the modified constraints
             """
             log.debug("Resolve the Model using gurobi")
-            for constraint in lp.constraints.values():
-                if constraint.modified:
-                    constraint.solverConstraint.setAttr(
-                        gurobipy.GRB.Attr.RHS, -constraint.constant
-                    )
+            # the right hand sides are changed with a single call
+            modified = [
+                constraint
+                for constraint in lp.constraints.values()
+                if constraint.modified
+            ]
+            if modified:
+                lp.solverModel.setAttr(
+                    gurobipy.GRB.Attr.RHS,
+                    [constraint.solverConstraint for constraint in modified],
+                    [-constraint.constant for constraint in modified],
+                )
             lp.solverModel.update()
             self.callSolver(lp, callback=callback)
             # get the solution information
             solutionStatus = self.findSolutionValues(lp)
-            for var in lp._variables:
-                var.modified = False
             for constraint in lp.constraints.values():
                 constraint.modified = False
             return solutionStatus
@@ -284,6 +326,13 @@ class GUROBI_CMD(LpSolver_CMD):
     """The GUROBI_CMD solver"""
 
     name = "GUROBI_CMD"
+    # GUROBI parameters: http://www.gurobi.com/documentation/7.5/refman/parameters.html#sec:Parameters
+    params_eq = dict(
+        logPath="LogFile",
+        gapRel="MIPGap",
+        gapAbs="MIPGapAbs",
+        threads="Threads",
+    )
 
     def __init__(
         self,
@@ -368,30 +417,27 @@ class GUROBI_CMD(LpSolver_CMD):
             os.remove(tmpSol)
         except:
             pass
-        cmd = self.path
         options = self.options + self.getOptions()
         if self.timeLimit is not None:
             options.append(("TimeLimit", self.timeLimit))
-        cmd += " " + " ".join(["%s=%s" % (key, value) for key, value in options])
-        cmd += " ResultFile=%s" % tmpSol
+        # the arguments are passed as a list so paths with spaces are kept whole
+        args = [self.path]
+        args.extend("%s=%s" % (key, value) for key, value in options)
+        args.append("ResultFile=%s" % tmpSol)
         if self.optionsDict.get("warmStart", False):
             self.writesol(filename=tmpMst, vs=vs)
-            cmd += " InputFile=%s" % tmpMst
+            args.append("InputFile=%s" % tmpMst)
 
         if lp.isMIP():
             if not self.mip:
                 warnings.warn("GUROBI_CMD does not allow a problem to be relaxed")
-        cmd += " %s" % tmpLp
+        args.append(tmpLp)
         if self.msg:
             pipe = None
         else:
-            pipe = open(os.devnull, "w")
-
-        return_code = subprocess.call(cmd.split(), stdout=pipe, stderr=pipe)
+            pipe = devnull
 
-        # Close the pipe now if we used it.
-        if pipe is not None:
-            pipe.close()
+        return_code = subprocess.call(args, stdout=pipe, stderr=pipe)
 
         if return_code != 0:
             raise PulpSolverError("PuLP: Error while trying to execute " + self.path)
@@ -404,10 +450,14 @@ class GUROBI_CMD(LpSolver_CMD):
             status, values, reducedCosts, shadowPrices, slacks = self.readsol(tmpSol)
         self.delete_tmp_files(tmpLp, tmpMst, tmpSol, "gurobi.log")
         if status != constants.LpStatusInfeasible:
-            lp.assignVarsVals(values)
-            lp.assignVarsDj(reducedCosts)
-            lp.assignConsPi(shadowPrices)
-            lp.assignConsSlack(slacks)
+            if values is not None:
+                lp.assignVarsVals(values)
+            if reducedCosts is not None:
+                lp.assignVarsDj(reducedCosts)
+            if shadowPrices is not None:
+                lp.assignConsPi(shadowPrices)
+            if slacks is not None:
+                lp.assignConsSlack(slacks)
         lp.assignStatus(status)
         return status
 
@@ -419,44 +469,34 @@ class GUROBI_CMD(LpSolver_CMD):
             except StopIteration:
                 # Empty file not solved
                 status = constants.LpStatusNotSolved
-                return status, {}, {}, {}, {}
+                return status, None, None, None, None
             # We have no idea what the status is assume optimal
             # TODO: check status for Integer Feasible
             status = constants.LpStatusOptimal
 
-            shadowPrices = {}
-            slacks = {}
-            shadowPrices = {}
-            slacks = {}
-            values = {}
-            reducedCosts = {}
-            for line in my_file:
-                if line[0] != "#":  # skip comments
-                    name, value = line.split()
-                    values[name] = float(value)
+            # the file has no reduced costs, shadow prices or slacks
+            reducedCosts = shadowPrices = slacks = None
+            # skip comments and build the values in a single comprehension
+            rows = (line.split() for line in my_file if line[0] != "#")
+            values = {name: float(value) for name, value in rows}
         return status, values, reducedCosts, shadowPrices, slacks
 
     def writesol(self, filename, vs):
         """Writes a GUROBI solution file"""
 
-        values = [(v.name, v.value()) for v in vs if v.value() is not None]
-        rows = []
-        for name, value in values:
-            rows.append("{} {}".format(name, value))
+        # each value is read once and the rows are joined into a single write
+        values = ((v.name, v.value()) for v in vs)
+        rows = (
+            "{} {}".format(name, value) for name, value in values if value is not None
+        )
         with open(filename, "w") as f:
             f.write("\n".join(rows))
         return True
 
     def getOptions(self):
-        # GUROBI parameters: http://www.gurobi.com/documentation/7.5/refman/parameters.html#sec:Parameters
-        params_eq = dict(
-            logPath="LogFile",
-            gapRel="MIPGap",
-            gapAbs="MIPGapAbs",
-            threads="Threads",
-        )
+        optionsDict = self.optionsDict
         return [
-            (v, self.optionsDict[k])
-            for k, v in params_eq.items()
-            if k in self.optionsDict and self.optionsDict[k] is not None
+            (v, optionsDict[k])
+            for k, v in self.params_eq.items()
+            if optionsDict.get(k) is not None
         ]
@@ -7,6 +7,11 @@ from pulp import LpVariable, LpProblem, lpSum, LpConstraintVar, LpFractionConstr
 from pulp import constants as const
 from pulp.tests.bin_packing_problem import create_bin_packing_problem
 from pulp.utilities import makeDict
+import os
+import shutil
+import stat
+import sys
+import tempfile
 import unittest
 
 
@@ -103,6 +108,9 @@ class BaseSolverTest:
             pulpTestCheck(
                 prob, self.solver, [const.LpStatusOptimal], {x: 4, y: -1, z: 6, w: 0}
             )
+            if self.solver.__class__ in [GUROBI]:
+                # gurobi solves in this process, its time must not be 0
+                self.assertGreater(self.solver.solveTime, 0)
 
         def test_pulp_011(self):
             # Continuous Maximisation
@@ -759,6 +767,19 @@ class BaseSolverTest:
             else:
                 pulpTestCheck(prob, self.solver, [const.LpStatusUnbounded])
 
+        def test_pulp_130(self):
+            """
+            Test that the solver variables keep the names of the pulp variables
+            """
+            prob = LpProblem("test130", const.LpMinimize)
+            x = LpVariable("x", 0, 4)
+            prob += x, "obj"
+            prob += x >= 1, "c1"
+            if self.solver.__class__ in [GUROBI]:
+                print("\t Testing solver variable names")
+                pulpTestCheck(prob, self.solver, [const.LpStatusOptimal], {x: 1})
+                self.assertEqual(x.solverVar.VarName, x.name)
+
         def test_pulpTestAll(self):
             """
             Test the availability of the function pulpTestAll
@@ -1317,6 +1338,67 @@ class GUROBI_CMDTest(BaseSolverTest.PuLPTest):
     solveInst = GUROBI_CMD
 
 
+class GUROBI_CMDStandInTest(unittest.TestCase):
+    """
+    Runs GUROBI_CMD against a stand-in gurobi_cl that writes a fixed solution
+    """
+
+    def setUp(self):
+        if os.name != "posix":
+            self.skipTest("the stand-in gurobi_cl is a python script")
+        # the space checks that the command line is not split on whitespace
+        self.tmpDir = tempfile.mkdtemp(suffix=" with space")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpDir)
+
+    def standInSolver(self, solution):
+        """
+        Returns a GUROBI_CMD whose executable writes solution to the ResultFile
+        No ResultFile is written if solution is None
+        """
+        path = os.path.join(self.tmpDir, "gurobi_cl")
+        with open(path, "w") as f:
+            f.write("#!{}\n".format(sys.executable))
+            if solution is not None:
+                f.write(
+                    "import sys\n"
+                    "for arg in sys.argv[1:]:\n"
+                    "    if arg.startswith('ResultFile='):\n"
+                    "        with open(arg[len('ResultFile='):], 'w') as f:\n"
+                    "            f.write({!r})\n".format(solution)
+                )
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        return GUROBI_CMD(path=path, msg=False)
+
+    def test_path_with_space(self):
+        prob = LpProblem(self._testMethodName, const.LpMinimize)
+        x = LpVariable("x", 0, 4)
+        y = LpVariable("y", 0, 4)
+        prob += x + y, "obj"
+        prob += x + y >= 3, "c1"
+        solver = self.standInSolver("# Objective value = 3\nx 1\ny 2\n")
+        pulpTestCheck(prob, solver, [const.LpStatusOptimal], {x: 1, y: 2})
+
+    def test_no_solution_file(self):
+        prob = LpProblem(self._testMethodName, const.LpMinimize)
+        x = LpVariable("x", 0, 4)
+        prob += x, "obj"
+        prob += x >= 1, "c1"
+        solver = self.standInSolver(None)
+        pulpTestCheck(prob, solver, [const.LpStatusNotSolved])
+        self.assertIsNone(x.value())
+
+    def test_empty_solution_file(self):
+        prob = LpProblem(self._testMethodName, const.LpMinimize)
+        x = LpVariable("x", 0, 4)
+        prob += x, "obj"
+        prob += x >= 1, "c1"
+        solver = self.standInSolver("")
+        pulpTestCheck(prob, solver, [const.LpStatusNotSolved])
+        self.assertIsNone(x.value())
+
+
 class PYGLPKTest(BaseSolverTest.PuLPTest):
     solveInst = PYGLPK
 